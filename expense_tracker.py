@@ -2,9 +2,14 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk, filedialog
 import json
 import os
+import time
+import hashlib
+import hmac
+import sqlite3
 from datetime import datetime
 import csv
-import matplotlib.pyplot as plt
+from collections import defaultdict
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import calendar
 try:
@@ -13,17 +18,41 @@ except ImportError:
     print("Error: tkcalendar module not found. Please install it using 'pip install tkcalendar'")
     Calendar = None  # Set Calendar to None to avoid further errors if the module is not installed
 import requests  # For currency conversion
+try:
+    import orjson  # Optional, much faster JSON serialization
+except ImportError:
+    orjson = None
 from tkinter import PhotoImage
 
+FX_CACHE_TTL = 300  # Seconds before cached exchange rates are refetched
+FX_REQUEST_TIMEOUT = 3  # Seconds to wait on the rates API
+LOAD_CHUNK_SIZE = 1000  # Expenses built per Tk callback when loading in the background
+USERS_DB = "users.db"
+LEGACY_USERS_FILE = "users.json"  # Plaintext store, imported into USERS_DB once
+LEGACY_USERS_BACKUP = "users.json.bak"  # Entries from LEGACY_USERS_FILE that could not be imported
+PBKDF2_ITERATIONS = 200_000
+
+
+def date_to_int(date):
+    # "YYYY-MM-DD" -> YYYYMMDD, which orders the same way as the date; raises ValueError on bad input
+    parsed = datetime.strptime(date, "%Y-%m-%d")
+    return parsed.year * 10000 + parsed.month * 100 + parsed.day
+
 # ---------- Expense Class ----------
 class Expense:
+    __slots__ = ("amount", "category", "description", "date", "payment_method", "currency", "_year", "_month", "_date_int", "_cat_code")
+
     def __init__(self, amount, category, description, date=None, payment_method="Cash", currency="INR"):
         self.amount = amount
         self.category = category
         self.description = description
         self.date = date if date else datetime.now().strftime("%Y-%m-%d")
+        # Parsed once here so filters can compare plain ints
+        self._date_int = date_to_int(self.date)
+        self._year, self._month = divmod(self._date_int // 100, 100)
         self.payment_method = payment_method
         self.currency = currency
+        self._cat_code = None  # Assigned by the tracker that stores this expense
 
     def to_dict(self):
         return {
@@ -38,56 +67,146 @@ class Expense:
 
 # ---------- Tracker ----------
 class ExpenseTracker:
-    def __init__(self, username):
+    def __init__(self, username, load=True):
         self.username = username
         self.expenses = []
         self.filename = f"{username}_expenses.json"
-        self.load_expenses()
+        self._cache = {}  # Query results, cleared whenever expenses change
+        self._month_totals = defaultdict(float)  # (year, month, category) -> spent
+        self._cat_to_code = {}  # Category -> small int code
+        self._codes = []  # Code -> category
+        self.loaded = False  # False until every expense has been read
+        if load:
+            self.load_expenses()
         self.budgets = {}  # Category-wise monthly budgets
         self.load_budgets()
+        self._session = requests.Session()  # Reuse connections to the rates API
+        self._fx_cache = {}  # Base currency -> (fetched_at, rates)
+        self.load_fx_cache()
+
+    def _index(self, expense):
+        code = self._cat_to_code.setdefault(expense.category, len(self._codes))
+        if code == len(self._codes):
+            self._codes.append(expense.category)
+        expense._cat_code = code
+        self._month_totals[(expense._year, expense._month, expense.category)] += expense.amount
 
     def add_expense(self, expense):
         self.expenses.append(expense)
+        self._index(expense)
+        self._cache.clear()
         self.save_expenses()
         self.check_budget(expense)
 
     def save_expenses(self):
-        with open(self.filename, "w") as f:
-            json.dump([e.to_dict() for e in self.expenses], f, indent=4)
+        # Both paths write 2-space indentation (the only indent orjson supports), so the
+        # file looks the same whichever is installed
+        data = [e.to_dict() for e in self.expenses]
+        if orjson:
+            with open(self.filename, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.filename, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def _read_expenses_file(self):
+        if not os.path.exists(self.filename):
+            return []
+        if orjson:
+            with open(self.filename, "rb") as f:
+                return orjson.loads(f.read())
+        with open(self.filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _reset(self):
+        self.expenses = []
+        self._month_totals = defaultdict(float)
+        self._cat_to_code = {}
+        self._codes = []
+        self._cache.clear()
 
     def load_expenses(self):
-        if os.path.exists(self.filename):
-            with open(self.filename, "r") as f:
-                data = json.load(f)
-                self.expenses = [Expense(**e) for e in data]
+        data = self._read_expenses_file()
+        self._reset()
+        for e in data:
+            exp = Expense(**e)
+            self.expenses.append(exp)
+            self._index(exp)
+        self.loaded = True
+
+    def load_expenses_in_chunks(self, root, on_done, chunk_size=LOAD_CHUNK_SIZE):
+        # Builds the expenses over several Tk callbacks so the window paints and stays
+        # responsive; callers must wait for `loaded` (or on_done) before querying or saving
+        data = self._read_expenses_file()
+        self._reset()
+        self.loaded = False
+
+        def load_chunk(start):
+            for e in data[start:start + chunk_size]:
+                exp = Expense(**e)
+                self.expenses.append(exp)
+                self._index(exp)
+            if start + chunk_size < len(data):
+                root.after(1, load_chunk, start + chunk_size)
+            else:
+                self._cache.clear()
+                self.loaded = True
+                on_done()
+
+        root.after(1, load_chunk, 0)
 
     def get_summary(self, year=None, month=None):
-        summary = {}
-        filtered_expenses = self.filter_expenses(year, month)
-        for exp in filtered_expenses:
-            summary[exp.category] = summary.get(exp.category, 0) + exp.amount
-        return summary
+        key = ("summary", year, month)
+        if key not in self._cache:
+            self._cache[key] = self._get_summary(year, month)
+        return self._cache[key]
+
+    def _get_summary(self, year, month):
+        # Filter and accumulate in one pass, without building a filtered list
+        summary = defaultdict(float)
+        for exp in self.expenses:
+            if year and exp._year != year:
+                continue
+            if month and exp._month != month:
+                continue
+            summary[exp._cat_code] += exp.amount
+        return {self._codes[code]: total for code, total in summary.items()}
+
+    def get_daily_totals(self, year=None, month=None):
+        key = ("daily", year, month)
+        if key not in self._cache:
+            totals = defaultdict(float)
+            for exp in self.filter_expenses(year, month):
+                totals[exp.date] += exp.amount
+            dates = sorted(totals)
+            self._cache[key] = (dates, [totals[date] for date in dates])
+        return self._cache[key]
 
     def search_expenses(self, keyword):
-        return [exp for exp in self.expenses if keyword.lower() in exp.description.lower() or keyword.lower() in exp.category.lower()]
+        keyword = keyword.lower()
+        return [exp for exp in self.expenses if keyword in exp.description.lower() or keyword in exp.category.lower()]
 
     def filter_by_category(self, category):
-        return [exp for exp in self.expenses if exp.category.lower() == category.lower()]
+        category = category.lower()
+        return [exp for exp in self.expenses if exp.category.lower() == category]
 
     def filter_by_date_range(self, start_date, end_date):
-        return [exp for exp in self.expenses if start_date <= exp.date <= end_date]
+        start, end = date_to_int(start_date), date_to_int(end_date)
+        return [exp for exp in self.expenses if start <= exp._date_int <= end]
 
     def delete_expense(self, date, category, amount, description):
-        self.expenses = [
-            exp
-            for exp in self.expenses
-            if not (
-                exp.date == date
-                and exp.category == category
-                and exp.amount == amount
-                and exp.description == description
-            )
-        ]
+        kept, removed = [], []
+        for exp in self.expenses:
+            if exp.date == date and exp.category == category and exp.amount == amount and exp.description == description:
+                removed.append(exp)
+            else:
+                kept.append(exp)
+        if not removed:
+            return  # Nothing to delete, skip the rewrite
+        for exp in removed:
+            self._month_totals[(exp._year, exp._month, exp.category)] -= exp.amount
+        self.expenses = kept
+        self._cache.clear()
         self.save_expenses()
 
     # Budget Management
@@ -109,7 +228,8 @@ class ExpenseTracker:
     def check_budget(self, expense):
         category = expense.category
         if category in self.budgets:
-            spent = sum(exp.amount for exp in self.filter_expenses(month=datetime.now().month, category=category))
+            today = datetime.now()
+            spent = self._month_totals.get((today.year, today.month, category), 0.0)
             if spent > self.budgets[category]:
                 messagebox.showwarning("Budget Alert", f"You have exceeded your budget for {category}!")
 
@@ -127,50 +247,98 @@ class ExpenseTracker:
         self.add_expense(expense)
 
     # Currency Conversion
+    def load_fx_cache(self):
+        fx_file = f"{self.username}_fx.json"
+        if os.path.exists(fx_file):
+            try:
+                with open(fx_file, "r") as f:
+                    self._fx_cache = {base: (fetched_at, rates) for base, (fetched_at, rates) in json.load(f).items()}
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                # The cache is disposable, so a bad file must not block startup
+                print(f"Ignoring unreadable exchange rate cache {fx_file}: {e}")
+                self._fx_cache = {}
+
+    def save_fx_cache(self):
+        fx_file = f"{self.username}_fx.json"
+        tmp_file = f"{fx_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self._fx_cache, f)
+        os.replace(tmp_file, fx_file)  # Atomic, so readers never see a half-written file
+
+    def get_rates(self, from_currency):
+        now = time.time()
+        cached = self._fx_cache.get(from_currency)
+        if cached and now - cached[0] < FX_CACHE_TTL:
+            return cached[1]
+
+        url = f"https://api.exchangerate-api.com/v4/latest/{from_currency}"
+        response = self._session.get(url, timeout=FX_REQUEST_TIMEOUT)
+        rates = response.json()["rates"]
+        self._fx_cache[from_currency] = (now, rates)
+        self.save_fx_cache()
+        return rates
+
     def convert_currency(self, amount, from_currency, to_currency="INR"):
         if from_currency == to_currency:
             return amount
 
-        url = f"https://api.exchangerate-api.com/v4/latest/{from_currency}"
         try:
-            response = requests.get(url)
-            data = response.json()
-            rate = data["rates"][to_currency]
+            rate = self.get_rates(from_currency)[to_currency]
             return amount * rate
         except Exception as e:
             messagebox.showerror("Currency Conversion Error", str(e))
             return None
 
     def filter_expenses(self, year=None, month=None, category=None, payment_method=None):
-        filtered = self.expenses
-        if year:
-            filtered = [exp for exp in filtered if datetime.strptime(exp.date, "%Y-%m-%d").year == year]
-        if month:
-            filtered = [exp for exp in filtered if datetime.strptime(exp.date, "%Y-%m-%d").month == month]
+        # Results are shared between callers, so treat them as read-only
+        key = ("filter", year, month, category, payment_method)
+        if key not in self._cache:
+            self._cache[key] = self._filter_expenses(year, month, category, payment_method)
+        return self._cache[key]
+
+    def _filter_expenses(self, year, month, category, payment_method):
+        # Single pass, cheapest checks first
+        code = None
         if category:
-            filtered = [exp for exp in filtered if exp.category == category]
-        if payment_method:
-            filtered = [exp for exp in filtered if exp.payment_method == payment_method]
+            code = self._cat_to_code.get(category)
+            if code is None:
+                return []
+        filtered = []
+        for exp in self.expenses:
+            if code is not None and exp._cat_code != code:
+                continue
+            if payment_method and exp.payment_method != payment_method:
+                continue
+            if year and exp._year != year:
+                continue
+            if month and exp._month != month:
+                continue
+            filtered.append(exp)
         return filtered
 
 
 # ---------- GUI ----------
 class ExpenseApp:
+    ICON_NAMES = ("add", "summary", "search", "filter", "export", "charts", "budget", "recurring", "delete")
+    _icons = None  # Shared while ExpenseApps use the same Tk root, loaded on first use
+
     def __init__(self, root, tracker):
         self.root = root
         self.tracker = tracker
-        self.root.title(f"Expense Tracker - {tracker.username}")
+        self.root.title(f"Expense Tracker - {tracker.username}" + ("" if tracker.loaded else " (loading...)"))
+        self._cal_window = None  # Date picker, built on first use
 
         # Load Images
-        self.add_icon = self.load_image("add_icon.png")
-        self.summary_icon = self.load_image("summary_icon.png")
-        self.search_icon = self.load_image("search_icon.png")
-        self.filter_icon = self.load_image("filter_icon.png")
-        self.export_icon = self.load_image("export_icon.png")
-        self.charts_icon = self.load_image("charts_icon.png")
-        self.budget_icon = self.load_image("budget_icon.png")
-        self.recurring_icon = self.load_image("recurring_icon.png")
-        self.delete_icon = self.load_image("delete_icon.png")
+        icons = self._get_icons(root)
+        self.add_icon = icons["add"]
+        self.summary_icon = icons["summary"]
+        self.search_icon = icons["search"]
+        self.filter_icon = icons["filter"]
+        self.export_icon = icons["export"]
+        self.charts_icon = icons["charts"]
+        self.budget_icon = icons["budget"]
+        self.recurring_icon = icons["recurring"]
+        self.delete_icon = icons["delete"]
 
         # Configure style
         self.style = ttk.Style()  # Initialize the style here
@@ -308,6 +476,15 @@ class ExpenseApp:
         self.chart_frame = ttk.Frame(parent, padding=10)
         self.chart_frame.grid(row=1, column=0, columnspan=3, sticky="nsew")
 
+        # Charts are created once and redrawn in place by update_dashboard
+        self.pie_fig = Figure(figsize=(4, 3))
+        self.pie_ax = self.pie_fig.add_subplot()
+        self.pie_canvas = FigureCanvasTkAgg(self.pie_fig, master=self.chart_frame)
+
+        self.bar_fig = Figure(figsize=(6, 3))  # Wider bar chart
+        self.bar_ax = self.bar_fig.add_subplot()
+        self.bar_canvas = FigureCanvasTkAgg(self.bar_fig, master=self.chart_frame)
+
         parent.grid_rowconfigure(1, weight=1)
         parent.grid_columnconfigure(0, weight=1)
         parent.grid_columnconfigure(1, weight=1)
@@ -315,7 +492,19 @@ class ExpenseApp:
 
         self.update_dashboard()
 
+    def expenses_loaded(self):
+        self.root.title(f"Expense Tracker - {self.tracker.username}")
+        self.update_table()
+        self.update_dashboard()
+
+    def check_loaded(self):
+        if not self.tracker.loaded:
+            messagebox.showinfo("Loading", "Expenses are still loading, please try again in a moment.")
+        return self.tracker.loaded
+
     def add_expense(self):
+        if not self.check_loaded():
+            return
         try:
             amount = float(self.amount_entry.get())
             category = self.category_entry.get()
@@ -332,14 +521,15 @@ class ExpenseApp:
             messagebox.showerror("Error", "Invalid amount entered!")
 
     def update_table(self, expenses=None):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        self.tree.delete(*self.tree.get_children())  # One Tcl call instead of one per row
         if expenses is None:
             expenses = self.tracker.expenses
         for exp in expenses:
             self.tree.insert("", "end", values=(exp.date, exp.category, exp.amount, exp.description, exp.payment_method, exp.currency))
 
     def show_summary(self):
+        if not self.check_loaded():
+            return
         year = self.get_dashboard_year()
         month = self.get_dashboard_month()
         summary = self.tracker.get_summary(year, month)
@@ -347,44 +537,43 @@ class ExpenseApp:
         messagebox.showinfo("Summary", msg if msg else "No expenses recorded.")
 
     def search_expense(self):
+        if not self.check_loaded():
+            return
         keyword = simpledialog.askstring("Search", "Enter keyword:")
         if keyword:
             results = self.tracker.search_expenses(keyword)
             self.update_table(results)
 
     def filter_category(self):
+        if not self.check_loaded():
+            return
         category = simpledialog.askstring("Filter", "Enter category:")
         if category:
             results = self.tracker.filter_by_category(category)
             self.update_table(results)
 
     def filter_date(self):
+        if not self.check_loaded():
+            return
         # Use Calendar popup for date selection
         if Calendar is None:
             messagebox.showerror("Error", "tkcalendar is not installed.")
             return
 
-        def popup_calendar(entry):
-            cal = Calendar(None, selectmode="day", date_pattern="yyyy-%m-%d")
-            cal.popup()
-            date = cal.selection_get()
-            entry.delete(0, tk.END)
-            entry.insert(0, date)
-
         filter_window = tk.Toplevel(self.root)
         filter_window.title("Date Filter")
 
         ttk.Label(filter_window, text="Start Date:").grid(row=0, column=0, padx=5, pady=5)
         start_date_entry = ttk.Entry(filter_window)
         start_date_entry.grid(row=0, column=1, padx=5, pady=5)
-        ttk.Button(filter_window, text="Choose Date", command=lambda: popup_calendar(start_date_entry)).grid(
+        ttk.Button(filter_window, text="Choose Date", command=lambda: self.choose_date(start_date_entry)).grid(
             row=0, column=2, padx=5, pady=5
         )
 
         ttk.Label(filter_window, text="End Date:").grid(row=1, column=0, padx=5, pady=5)
         end_date_entry = ttk.Entry(filter_window)
         end_date_entry.grid(row=1, column=1, padx=5, pady=5)
-        ttk.Button(filter_window, text="Choose Date", command=lambda: popup_calendar(end_date_entry)).grid(
+        ttk.Button(filter_window, text="Choose Date", command=lambda: self.choose_date(end_date_entry)).grid(
             row=1, column=2, padx=5, pady=5
         )
 
@@ -392,13 +581,44 @@ class ExpenseApp:
             start = start_date_entry.get()
             end = end_date_entry.get()
             if start and end:
-                results = self.tracker.filter_by_date_range(start, end)
+                try:
+                    results = self.tracker.filter_by_date_range(start, end)
+                except ValueError:
+                    messagebox.showerror("Error", "Dates must be in YYYY-MM-DD format!")
+                    return
                 self.update_table(results)
             filter_window.destroy()
 
         ttk.Button(filter_window, text="Apply Filter", command=apply_filter).grid(row=2, column=0, columnspan=3, pady=10)
 
+    def choose_date(self, entry):
+        # One Calendar is reused for every pick; it is hidden rather than destroyed
+        if self._cal_window is None:
+            self._cal_window = tk.Toplevel(self.root)
+            self._cal_window.title("Choose Date")
+            self._cal_window.protocol("WM_DELETE_WINDOW", self.hide_calendar)
+            self._cal = Calendar(self._cal_window, selectmode="day", date_pattern="yyyy-mm-dd")
+            self._cal.pack(padx=5, pady=5)
+            self._cal_button = ttk.Button(self._cal_window, text="OK")
+            self._cal_button.pack(pady=5)
+
+        def pick():
+            entry.delete(0, tk.END)
+            entry.insert(0, self._cal.get_date())
+            self.hide_calendar()
+
+        self._cal_button.configure(command=pick)
+        self._cal_window.deiconify()
+        self._cal_window.lift()
+        self._cal_window.grab_set()
+
+    def hide_calendar(self):
+        self._cal_window.grab_release()
+        self._cal_window.withdraw()
+
     def export_csv(self):
+        if not self.check_loaded():
+            return
         filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
         if filename:
             with open(filename, "w", newline="") as f:
@@ -409,6 +629,8 @@ class ExpenseApp:
             messagebox.showinfo("Export", f"Expenses exported to {filename}")
 
     def show_charts(self):
+        if not self.check_loaded():
+            return
         year = self.get_dashboard_year()
         month = self.get_dashboard_month()
         summary = self.tracker.get_summary(year, month)
@@ -420,7 +642,8 @@ class ExpenseApp:
         chart_window.title("Expense Charts")
 
         # Pie Chart
-        fig, ax = plt.subplots(figsize=(5, 4))
+        fig = Figure(figsize=(5, 4))
+        ax = fig.add_subplot()
         ax.pie(summary.values(), labels=summary.keys(), autopct="%1.1f%%")
         ax.set_title("Category-wise Expenses")
 
@@ -429,7 +652,8 @@ class ExpenseApp:
         canvas.draw()
 
         # Bar Chart
-        fig2, ax2 = plt.subplots(figsize=(5, 4))
+        fig2 = Figure(figsize=(5, 4))
+        ax2 = fig2.add_subplot()
         categories = list(summary.keys())
         amounts = list(summary.values())
         ax2.bar(categories, amounts)
@@ -443,16 +667,10 @@ class ExpenseApp:
         canvas2.draw()
 
         # Line Chart (Expenses over time)
-        expenses_by_date = {}
-        filtered_expenses = self.tracker.filter_expenses(year=year, month=month)
-        for exp in filtered_expenses:
-            date = exp.date
-            expenses_by_date[date] = expenses_by_date.get(date, 0) + exp.amount
-
-        dates = sorted(expenses_by_date.keys())
-        amounts = [expenses_by_date[date] for date in dates]
+        dates, amounts = self.tracker.get_daily_totals(year, month)
 
-        fig3, ax3 = plt.subplots(figsize=(5, 4))
+        fig3 = Figure(figsize=(5, 4))
+        ax3 = fig3.add_subplot()
         ax3.plot(dates, amounts)
         ax3.set_title("Expenses Over Time")
         ax3.set_xlabel("Date")
@@ -467,6 +685,8 @@ class ExpenseApp:
         messagebox.showinfo("About", "Personal Expense Tracker\nVersion 1.0")
 
     def delete_selected_expense(self):
+        if not self.check_loaded():
+            return
         selected_item = self.tree.selection()
         if not selected_item:
             messagebox.showinfo("Delete", "Please select an expense to delete.")
@@ -496,6 +716,9 @@ class ExpenseApp:
                 messagebox.showerror("Error", "Invalid amount entered!")
 
     def add_recurring_expense(self):
+        if not self.check_loaded():
+            return
+
         def add():
             try:
                 amount = float(amount_entry.get())
@@ -531,44 +754,37 @@ class ExpenseApp:
         ttk.Button(recurring_window, text="Add", command=add).grid(row=4, column=0, columnspan=2, pady=10)
 
     def update_dashboard(self):
-        # Clear previous charts
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
+        if not self.tracker.loaded:
+            return  # expenses_loaded redraws once loading finishes
+        # Hide previous charts
+        self.pie_canvas.get_tk_widget().pack_forget()
+        self.bar_canvas.get_tk_widget().pack_forget()
 
         year = self.get_dashboard_year()
         month = self.get_dashboard_month()
 
         summary = self.tracker.get_summary(year, month)
-        expenses = self.tracker.filter_expenses(year, month)
 
         # --- Pie Chart ---
         if summary:
-            fig_pie, ax_pie = plt.subplots(figsize=(4, 3))
-            ax_pie.pie(summary.values(), labels=summary.keys(), autopct="%1.1f%%")
-            ax_pie.set_title("Expenses by Category")
-            canvas_pie = FigureCanvasTkAgg(fig_pie, master=self.chart_frame)
-            canvas_pie.get_tk_widget().pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            canvas_pie.draw()
+            self.pie_ax.clear()
+            self.pie_ax.pie(summary.values(), labels=summary.keys(), autopct="%1.1f%%")
+            self.pie_ax.set_title("Expenses by Category")
+            self.pie_canvas.get_tk_widget().pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            self.pie_canvas.draw_idle()
 
         # --- Bar Chart (Expenses Over Time) ---
-        expenses_by_date = {}
-        for exp in expenses:
-            date = exp.date
-            expenses_by_date[date] = expenses_by_date.get(date, 0) + exp.amount
-
-        dates = sorted(expenses_by_date.keys())
-        amounts = [expenses_by_date[date] for date in dates]
+        dates, amounts = self.tracker.get_daily_totals(year, month)
 
         if dates:
-            fig_bar, ax_bar = plt.subplots(figsize=(6, 3))  # Wider bar chart
-            ax_bar.bar(dates, amounts)
-            ax_bar.set_title("Expenses Over Time")
-            ax_bar.set_xlabel("Date")
-            ax_bar.set_ylabel("Amount")
-            fig_bar.autofmt_xdate()  # Rotate date labels
-            canvas_bar = FigureCanvasTkAgg(fig_bar, master=self.chart_frame)
-            canvas_bar.get_tk_widget().pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            canvas_bar.draw()
+            self.bar_ax.clear()
+            self.bar_ax.bar(dates, amounts)
+            self.bar_ax.set_title("Expenses Over Time")
+            self.bar_ax.set_xlabel("Date")
+            self.bar_ax.set_ylabel("Amount")
+            self.bar_fig.autofmt_xdate()  # Rotate date labels
+            self.bar_canvas.get_tk_widget().pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            self.bar_canvas.draw_idle()
 
     def get_dashboard_year(self):
         try:
@@ -602,26 +818,92 @@ class ExpenseApp:
             self.style.configure("Treeview", background="white", foreground="black")
             self.style.configure("Treeview.Heading", background="SystemButtonFace", foreground="black")
 
-    def load_image(self, filename):
+    @classmethod
+    def _get_icons(cls, root):
+        # Images belong to the Tk interpreter that created them, so reload for a new root
+        if cls._icons is None or not all(
+            icon is None or str(icon) in root.image_names() for icon in cls._icons.values()
+        ):
+            cls._icons = {name: cls.load_image(f"{name}_icon.png", root) for name in cls.ICON_NAMES}
+        return cls._icons
+
+    @staticmethod
+    def load_image(filename, master=None):
         try:
             # Assuming images are in the same directory as the script
             filepath = os.path.join(os.path.dirname(__file__), filename)
-            return PhotoImage(file=filepath)
+            return PhotoImage(file=filepath, master=master)
         except tk.TclError as e:
             print(f"Error loading image {filename}: {e}")
             return None
 
 
 # ---------- User Authentication ----------
+def hash_password(password):
+    # Stored as "pbkdf2_sha256$<iterations>$<salt>$<digest>" so the parameters can change later
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(pw_hash, password):
+    try:
+        algorithm, iterations, salt, digest = pw_hash.split("$")
+        if algorithm != "pbkdf2_sha256":
+            return False
+        expected = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+        return hmac.compare_digest(expected, bytes.fromhex(digest))
+    except (AttributeError, ValueError, OverflowError):
+        return False
+
+
+def open_users_db():
+    created = not os.path.exists(USERS_DB)
+    migrate = created and os.path.exists(LEGACY_USERS_FILE)
+    conn = sqlite3.connect(USERS_DB)
+    try:
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, pw_hash TEXT NOT NULL)")
+            if migrate:
+                # Carry over accounts from the old plaintext users.json
+                with open(LEGACY_USERS_FILE, "r") as f:
+                    users = json.load(f)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO users (username, pw_hash) VALUES (?, ?)",
+                    [(name, hash_password(pw)) for name, pw in users.items() if isinstance(pw, str)],
+                )
+    except Exception:
+        # Remove a half-built database so the import is retried on the next start
+        conn.close()
+        if created:
+            os.remove(USERS_DB)
+        raise
+
+    if migrate:
+        # The passwords are hashed in the database now; don't leave them on disk in plaintext
+        skipped = {name: value for name, value in users.items() if not isinstance(value, str)}
+        try:
+            if skipped:
+                # Keep what could not be imported, without the plaintext passwords that were
+                with open(LEGACY_USERS_BACKUP, "w") as f:
+                    json.dump(skipped, f, indent=4)
+                print(f"Skipped users without a password: {', '.join(skipped)} (saved to {LEGACY_USERS_BACKUP})")
+            os.remove(LEGACY_USERS_FILE)
+            print(f"Imported users into {USERS_DB} and removed plaintext {LEGACY_USERS_FILE}")
+        except OSError as e:
+            print(f"Warning: {LEGACY_USERS_FILE} was left in place and still holds plaintext passwords: {e}")
+    return conn
+
+
 def authenticate():
-    users_file = "users.json"
+    conn = open_users_db()
+    try:
+        return _authenticate(conn)
+    finally:
+        conn.close()
 
-    if os.path.exists(users_file):
-        with open(users_file, "r") as f:
-            users = json.load(f)
-    else:
-        users = {}
 
+def _authenticate(conn):
     root = tk.Tk()
     root.withdraw()
     action = simpledialog.askstring("Login/Register", "Type 'login' or 'register':")
@@ -629,19 +911,23 @@ def authenticate():
     if action == "register":
         username = simpledialog.askstring("Register", "Enter username:")
         password = simpledialog.askstring("Register", "Enter password:", show="*")
-        if username in users:
+        if not username or not password:
+            return None, None
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO users (username, pw_hash) VALUES (?, ?)", (username, hash_password(password))
+            )
+        if cursor.rowcount == 0:
             messagebox.showerror("Error", "User already exists!")
             return None, None
-        users[username] = password
-        with open(users_file, "w") as f:
-            json.dump(users, f, indent=4)
         messagebox.showinfo("Success", "User registered successfully!")
         return username, password
 
     elif action == "login":
         username = simpledialog.askstring("Login", "Enter username:")
         password = simpledialog.askstring("Login", "Enter password:", show="*")
-        if username in users and users[username] == password:
+        row = conn.execute("SELECT pw_hash FROM users WHERE username = ?", (username,)).fetchone()
+        if row and password is not None and verify_password(row[0], password):
             messagebox.showinfo("Success", "Login successful!")
             return username, password
         else:
@@ -656,6 +942,7 @@ if __name__ == "__main__":
     username, password = authenticate()
     if username:
         root = tk.Tk()
-        tracker = ExpenseTracker(username)
+        tracker = ExpenseTracker(username, load=False)
         app = ExpenseApp(root, tracker)
+        tracker.load_expenses_in_chunks(root, app.expenses_loaded)
         root.mainloop()